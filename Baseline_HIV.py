@@ -49,18 +49,15 @@ left_bins = age_bins[:-1]
 right_bins = age_bins[1:]
 left_right = list(zip(left_bins, right_bins))
 age_vals = list(age_data.values())
+age_edges = np.array(age_bins)  # Lookup table for age_dependent_prevalence
+age_table = np.array(age_vals)
 
 # Define age-dependent initial prevalence function
 def age_dependent_prevalence(module=None, sim=None, size=None):
     ages = sim.people.age[size]  # Initial ages of agents
-    prevalence = np.zeros(len(ages))
-    
-    for i in range(n_age_bins):
-        left = age_bins[i]
-        right = age_bins[i+1]
-        value = age_vals[i]
-        prevalence[(ages >= left) & (ages < right)] = value
-
+    # Look up each agent's age bin in a single pass; ages of 99+ fall in the last bin, which has value 0
+    bin_inds = np.searchsorted(age_edges, ages, side='right') - 1
+    prevalence = age_table[bin_inds]
     return prevalence
 
 # Initialize HIV with age-dependent initial prevalence
@@ -16,6 +16,12 @@ __all__ = [
 ]
 # 'Diabetes',
 
+
+def _true_uids(arr, mask):
+    """ UIDs where a mask over arr's active agents is True; skips the BoolArr/asnew temporary of (...).uids """
+    return arr.auids[np.flatnonzero(mask)]
+
+
 class Type1Diabetes(ss.NCD):
     
     def __init__(self, pars=None, **kwargs):
@@ -340,10 +346,10 @@ class Hypertension(ss.NCD):
 
     def update_pre(self):
         sim = self.sim
-        recovered = (self.affected & (self.ti_recovered <= sim.ti)).uids
+        recovered = _true_uids(self.affected, self.affected.values & (self.ti_recovered.values <= sim.ti))
         self.affected[recovered] = False
         self.susceptible[recovered] = True
-        deaths = (self.ti_dead == sim.ti).uids
+        deaths = _true_uids(self.ti_dead, self.ti_dead.values == sim.ti)
         sim.people.request_death(deaths)
         self.results.new_deaths[sim.ti] = len(deaths)
         return
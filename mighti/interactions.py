@@ -388,14 +388,11 @@ def read_interactions(datafile=None):
         datafile = '../mighti/data/rel_sus.csv'
     df = pd.read_csv(datafile)
 
-    rel_sus = defaultdict(dict)
+    # Reshape to one row per (condition, interacting condition) pair, keeping only specified interactions
+    long_df = df.melt(id_vars='has_condition', var_name='interacting_cond', value_name='rel_sus').dropna(subset=['rel_sus'])
 
-    for cond in df.has_condition.unique():
-        conddf = df.loc[df.has_condition == cond]
-        conddf.reset_index(inplace=True, drop=True)
-        interacting_conds = conddf.columns[~conddf.isna().any()].tolist()
-        interacting_conds.remove('has_condition')
-        for interacting_cond in interacting_conds:
-            rel_sus[interacting_cond][cond] = conddf.loc[0, interacting_cond]
+    rel_sus = defaultdict(dict)
+    for interacting_cond, conddf in long_df.groupby('interacting_cond', sort=False):
+        rel_sus[interacting_cond] = dict(zip(conddf.has_condition, conddf.rel_sus))
 
-    return rel_sus
\ No newline at end of file
+    return rel_sus
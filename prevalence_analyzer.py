@@ -13,14 +13,15 @@ class PrevalenceAnalyzer(ss.Analyzer):
 
         # Initialize age bins for each disease
         self.age_bins = {}
+        self.age_edges = {}  # As arrays, for np.digitize
         self.age_groups = {}
 
         # Iterate over each disease and assign age bins
         for disease in self.diseases:
-            self.age_bins[disease] = list(prevalence_data[disease]['male'].keys())
-            self.age_bins[disease].sort()  # Ensure age bins are sorted
+            self.age_bins[disease] = tuple(sorted(prevalence_data[disease]['male'].keys()))  # Ensure age bins are sorted
             # Create age groups with "inf" for the last bin (80+)
             self.age_groups[disease] = list(zip(self.age_bins[disease][:-1], self.age_bins[disease][1:])) + [(self.age_bins[disease][-1], float('inf'))]
+            self.age_edges[disease] = np.array(self.age_bins[disease])
 
         self.results = sc.odict()
 
@@ -28,18 +29,19 @@ class PrevalenceAnalyzer(ss.Analyzer):
         super().init_pre(sim)
         npts = sim.npts  # Number of time points in the simulation
 
-        # Initialize result arrays for each disease: time x age groups
+        # Initialize result arrays for each disease: time x age groups. Prevalences are fractions, so float32 is ample
         for disease in self.diseases:
-            self.results[f'{disease}_prevalence_male'] = np.zeros((npts, len(self.age_groups[disease])))
-            self.results[f'{disease}_prevalence_female'] = np.zeros((npts, len(self.age_groups[disease])))
+            self.results[f'{disease}_prevalence_male'] = np.zeros((npts, len(self.age_groups[disease])), dtype=np.float32)
+            self.results[f'{disease}_prevalence_female'] = np.zeros((npts, len(self.age_groups[disease])), dtype=np.float32)
 
         print(f"Initialized prevalence array with {npts} time points for {self.diseases}.")
         return
 
     def apply(self, sim):
         print(f"Applying analyzer at time step {sim.ti}")
-        ages = sim.people.age
-        females = sim.people.female
+        ages = sim.people.age.values
+        females = sim.people.female.values
+        age_sex_groups = {}  # Group assignments and populations, shared by diseases that use the same age bins
     
         for disease in self.diseases:
             disease_obj = getattr(sim.diseases, disease.lower())
@@ -47,20 +49,23 @@ class PrevalenceAnalyzer(ss.Analyzer):
                 status_attr = 'infected'
             else:
                 status_attr = 'affected'
-    
-            for sex, label in zip([0, 1], ['male', 'female']):
-                prevalence_by_age_group = np.zeros(len(self.age_groups[disease]))
-    
-                for i, (start, end) in enumerate(self.age_groups[disease]):
-                    if end == float('inf'):
-                        age_mask = (ages >= start) & (females == sex)
-                    else:
-                        age_mask = (ages >= start) & (ages < end) & (females == sex)
-    
-                    status_array = getattr(disease_obj, status_attr)
-                    if np.sum(age_mask) > 0:
-                        prevalence_by_age_group[i] = np.mean(status_array[age_mask])
-    
-                disease_key = f'{disease}_prevalence_{label}'
-                # print(f"Storing data for {disease_key} at time {sim.ti}")  # Add this to confirm data is stored
-                self.results[disease_key][sim.ti, :] = prevalence_by_age_group
\ No newline at end of file
+            status_array = getattr(disease_obj, status_attr).values
+
+            # Assign each agent to an age-sex group in one pass: males first, then females; the last age group is open-ended (80+)
+            n_groups = len(self.age_groups[disease])
+            bins_key = self.age_bins[disease]
+            if bins_key not in age_sex_groups:
+                group_idx = np.digitize(ages, self.age_edges[disease]) - 1
+                in_group = group_idx >= 0
+                group_idx = group_idx[in_group] + n_groups * females[in_group]
+                counts = np.bincount(group_idx, minlength=2 * n_groups)
+                age_sex_groups[bins_key] = (in_group, group_idx, counts)
+            in_group, group_idx, counts = age_sex_groups[bins_key]
+
+            # Number affected in every age-sex group in a single reduction
+            n_affected = np.bincount(group_idx, weights=status_array[in_group], minlength=2 * n_groups)
+            prevalence = np.divide(n_affected, counts, out=np.zeros(2 * n_groups), where=counts > 0)
+            self.results[f'{disease}_prevalence_male'][sim.ti] = prevalence[:n_groups]
+            self.results[f'{disease}_prevalence_female'][sim.ti] = prevalence[n_groups:]
+        return
+